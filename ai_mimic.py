@@ -1,11 +1,13 @@
 # ai_mimic.py - Enhanced AI-powered honeypot response engine with ML
 import json
+import os
 import re
 import time
 import random
 from datetime import datetime
 import pickle
 from collections import Counter
+from persona_cache import PersonaCache
 
 class SimpleMLClassifier:
     def __init__(self):
@@ -36,6 +38,7 @@ class AIMimicEngine:
         self.response_templates = self.load_response_templates()
         self.attack_history = []
         self.ml_classifier = SimpleMLClassifier()  # Initialize ML classifier
+        self.persona_cache = self.load_persona_cache()
         
     def load_attack_patterns(self):
         """Define common IoT attack patterns"""
@@ -73,55 +76,25 @@ class AIMimicEngine:
         }
     
     def load_response_templates(self):
-        """Define realistic IoT device responses with strategic delays"""
+        """Define strategic delays per threat level (bodies come from the persona pack)"""
         return {
-            'CRITICAL': {
-                'delay': 8,  # Maximum delay to waste attacker time
-                'responses': [
-                    "Error: Device firmware corrupted. Rebooting...",
-                    "Bootloader: Verifying system integrity...",
-                    "Security: Unauthorized access detected. Initiating safe mode...",
-                    "IoT Device: Critical error. Contact administrator.",
-                    "System: Performing emergency security scan...",
-                    "Firmware: Checksum verification failed. Recovery mode activated."
-                ],
-                'status_code': 500
-            },
-            'HIGH': {
-                'delay': 5,
-                'responses': [
-                    "Admin: Session expired. Please re-authenticate.",
-                    "Security: Too many failed login attempts. Try again in 5 minutes.",
-                    "Device: Rate limit exceeded. Temporary lockout activated.",
-                    "System: Unusual activity detected. Enhanced verification required.",
-                    "Access: Administrator privileges required for this operation."
-                ],
-                'status_code': 403
-            },
-            'MEDIUM': {
-                'delay': 3,
-                'responses': [
-                    "404: Page not found",
-                    "Service: Temporarily unavailable",
-                    "Device: Busy processing previous request",
-                    "Error: Invalid request format",
-                    "Status: Device undergoing maintenance"
-                ],
-                'status_code': 404
-            },
-            'LOW': {
-                'delay': 1,
-                'responses': [
-                    "IoT Device Ready",
-                    "Status: Online - All systems operational",
-                    "Welcome to Smart Device Interface",
-                    "Device: Connected and responding",
-                    "System: Normal operation"
-                ],
-                'status_code': 200
-            }
+            'CRITICAL': {'delay': 8},  # Maximum delay to waste attacker time
+            'HIGH': {'delay': 5},
+            'MEDIUM': {'delay': 3},
+            'LOW': {'delay': 1}
         }
     
+    def load_persona_cache(self):
+        """Pre-render device persona pages, optionally from PERSONA_PACK"""
+        persona_cache = PersonaCache()
+        pack_path = os.environ.get('PERSONA_PACK')
+        if pack_path:
+            try:
+                persona_cache.load_file(pack_path)
+            except Exception as e:
+                print(f"⚠️ Could not load persona pack {pack_path}: {e}")
+        return persona_cache
+    
     def _combine_predictions(self, rule_threat, ml_threat):
         """Combine rule-based and ML predictions - take higher threat level"""
         threat_levels = {'LOW': 1, 'MEDIUM': 2, 'HIGH': 3, 'CRITICAL': 4}
@@ -210,7 +183,7 @@ class AIMimicEngine:
             
         return response
     
-    def generate_response(self, threat_level, original_response=""):
+    def generate_response(self, threat_level, original_response="", path=""):
         """Generate a deceptive response with strategic delays"""
         template = self.response_templates[threat_level]
         
@@ -219,20 +192,22 @@ class AIMimicEngine:
         print(delay_msg)
         time.sleep(template['delay'])
         
-        # Choose deceptive response
-        deceptive_response = random.choice(template['responses'])
+        # Choose a pre-rendered persona page for this route and threat level
+        page = self.persona_cache.select(path, threat_level)
         
         # Enhanced logging
-        mimic_msg = f"🎭 AI: Sending deceptive response: '{deceptive_response}'"
+        mimic_msg = f"🎭 AI: Sending deceptive response: '{page.name}' ({page.status_code})"
         print(mimic_msg)
         
         return {
-            'response_body': deceptive_response,
-            'status_code': template['status_code'],
-            'headers': {'Content-Type': 'text/plain'},
+            'response_body': page.body,
+            'status_code': page.status_code,
+            'headers': page.headers,
+            'etag': page.etag,
             'ai_response': {
                 'response_type': 'deceptive',
                 'threat_level': threat_level,
+                'persona_page': page.name,
                 'delay_applied': template['delay'],
                 'timestamp': datetime.now().isoformat()
             }
@@ -1,5 +1,5 @@
 from flask import Flask, request, Response, jsonify
-import os, requests, json, datetime, sys, time
+import os, requests, json, datetime, sys, time, signal
 
 sys.path.append('/app/data')
 
@@ -84,13 +84,35 @@ def honeypot_catch_all(path=''):
             print(f"⏳ Applying delay: {delay}s")
             time.sleep(delay)
         
+        # Conditional request: only 2xx persona pages take part (RFC 9110)
+        etag = response.get('etag')
+        status_code = response.get('status_code', 200)
+        if (etag and 200 <= status_code < 300
+                and request.if_none_match.contains_weak(etag.strip('"'))):
+            # Keep the persona Server header so Werkzeug doesn't add its own
+            page_headers = [h for h in response.get('headers', ())
+                            if h[0] in ('Server', 'ETag', 'Cache-Control')]
+            if request.method in ('GET', 'HEAD'):
+                return Response(status=304, headers=page_headers)
+            return Response(status=412, headers=[h for h in page_headers if h[0] == 'Server'])
+        
         return Response(
             response.get('response_body', ''),
-            status=response.get('status_code', 200),
+            status=status_code,
             headers=response.get('headers', {})
         )
     return "RL Honeypot Active", 200
 
+def reload_persona_pack(signum=None, frame=None):
+    """Hot-swap the persona pack from PERSONA_PACK (triggered by SIGHUP)"""
+    pack_path = os.environ.get('PERSONA_PACK')
+    if not (RL_AVAILABLE and enhanced_honeypot and pack_path):
+        return
+    try:
+        enhanced_honeypot.ai_engine.persona_cache.load_file(pack_path)
+    except Exception as e:
+        print(f"⚠️ Could not reload persona pack {pack_path}: {e}")
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 8080))
     print("="*60)
@@ -98,5 +120,8 @@ if __name__ == '__main__':
     print(f"📍 Port: {port}")
     print(f"📱 Flutter APIs: /api/metrics, /api/live_attacks")
     print(f"🤖 RL Available: {RL_AVAILABLE}")
+    print(f"🎭 Persona pack: {os.environ.get('PERSONA_PACK', 'built-in')} (SIGHUP to reload)")
     print("="*60)
+    if hasattr(signal, 'SIGHUP'):
+        signal.signal(signal.SIGHUP, reload_persona_pack)
     app.run(host='0.0.0.0', port=port, debug=False, threaded=True)
@@ -0,0 +1,307 @@
+# persona_cache.py - Pre-rendered IoT device persona pages for deceptive responses
+import hashlib
+import json
+import random
+import re
+
+THREAT_LEVELS = ('LOW', 'MEDIUM', 'HIGH', 'CRITICAL')
+
+
+def default_persona_pack():
+    """Define a realistic Boa-based GPON router persona"""
+    login_page = (
+        '<html>\n<head>\n<meta http-equiv="Content-Type" content="text/html; charset=utf-8">\n'
+        '<title>GPON Home Gateway</title>\n'
+        '<link rel="stylesheet" type="text/css" href="/style/default.css">\n'
+        '</head>\n<body>\n<div class="login">\n'
+        '<form action="/boaform/admin/formLogin" method="post" name="cmlogin">\n'
+        '<table>\n'
+        '<tr><td>Username:</td><td><input type="text" name="username" maxlength="31"></td></tr>\n'
+        '<tr><td>Password:</td><td><input type="password" name="psd" maxlength="31"></td></tr>\n'
+        '</table>\n'
+        '<input type="submit" value="Login">\n'
+        '<input type="hidden" name="submit-url" value="/admin/login.asp">\n'
+        '</form>\n</div>\n</body>\n</html>\n'
+    )
+    return {
+        'name': 'gpon-boa-router',
+        'server': 'Boa/0.94.14rc21',
+        'pages': {
+            'login_form': {
+                'status': 200,
+                'content_type': 'text/html; charset=utf-8',
+                'body': login_page
+            },
+            'login_failed': {
+                'status': 200,
+                'content_type': 'text/html; charset=utf-8',
+                'body': (
+                    '<html><head><title>GPON Home Gateway</title></head>\n<body>\n'
+                    '<h4>ERROR: bad password!</h4>\n'
+                    '<form><input type="button" value="  OK  " '
+                    'onclick="window.location.href=\'/admin/login.asp\'"></form>\n'
+                    '</body></html>\n'
+                )
+            },
+            'login_locked': {
+                'status': 200,
+                'content_type': 'text/html; charset=utf-8',
+                'body': (
+                    '<html><head><title>GPON Home Gateway</title></head>\n<body>\n'
+                    '<h4>You have failed to login 3 times, please try again after 1 minute!</h4>\n'
+                    '</body></html>\n'
+                )
+            },
+            'status_json': {
+                'status': 200,
+                'content_type': 'application/json',
+                'body': json.dumps({
+                    'device_name': 'HG8245H',
+                    'software_version': 'V3R017C10S121',
+                    'hardware_version': '3C7.A',
+                    'uptime': 1829374,
+                    'wan_status': 'Connected',
+                    'pon_status': 'O5',
+                    'cpu_usage': 7,
+                    'mem_usage': 41
+                }, separators=(',', ':'))
+            },
+            'status_json_denied': {
+                'status': 401,
+                'content_type': 'application/json',
+                'body': json.dumps({'errcode': 401, 'errmsg': 'session timeout'},
+                                   separators=(',', ':'))
+            },
+            'forbidden': {
+                'status': 403,
+                'content_type': 'text/html',
+                'body': (
+                    '<HTML><HEAD><TITLE>403 Forbidden</TITLE></HEAD>\n'
+                    '<BODY><H1>403 Forbidden</H1>\n'
+                    'Your client does not have permission to access this resource.\n'
+                    '</BODY></HTML>\n'
+                )
+            },
+            'not_found': {
+                'status': 404,
+                'content_type': 'text/html',
+                'body': (
+                    '<HTML><HEAD><TITLE>404 Not Found</TITLE></HEAD>\n'
+                    '<BODY><H1>404 Not Found</H1>\n'
+                    'The requested URL was not found on this server.\n'
+                    '</BODY></HTML>\n'
+                )
+            },
+            'bad_request': {
+                'status': 400,
+                'content_type': 'text/html',
+                'body': (
+                    '<HTML><HEAD><TITLE>400 Bad Request</TITLE></HEAD>\n'
+                    '<BODY><H1>400 Bad Request</H1>\n'
+                    'Your client has issued a malformed or illegal request.\n'
+                    '</BODY></HTML>\n'
+                )
+            },
+            'server_error': {
+                'status': 500,
+                'content_type': 'text/html',
+                'body': (
+                    '<HTML><HEAD><TITLE>500 Server Error</TITLE></HEAD>\n'
+                    '<BODY><H1>500 Server Error</H1>\n'
+                    'The server encountered an internal error and could not complete your request.\n'
+                    '</BODY></HTML>\n'
+                )
+            },
+            'cgi_error': {
+                'status': 502,
+                'content_type': 'text/html',
+                'body': (
+                    '<HTML><HEAD><TITLE>502 Bad Gateway</TITLE></HEAD>\n'
+                    '<BODY><H1>502 Bad Gateway</H1>\n'
+                    'The CGI was not CGI/1.1 compliant.\n'
+                    '</BODY></HTML>\n'
+                )
+            }
+        },
+        # First matching route wins; threat levels missing here use 'fallback'.
+        # AIMimicEngine rates these paths HIGH (iot_common/admin_scanning) or
+        # CRITICAL, so only bare '.cgi' files ever reach a route at MEDIUM.
+        'routes': [
+            [r'/status\.json', {
+                'HIGH': ['status_json'],
+                'CRITICAL': ['status_json_denied']
+            }],
+            [r'/boaform/', {
+                'HIGH': ['login_form', 'login_failed'],
+                'CRITICAL': ['login_locked', 'forbidden']
+            }],
+            [r'/(formLogin|login\.cgi|login\.asp|login|admin)', {
+                'HIGH': ['login_form', 'login_failed'],
+                'CRITICAL': ['login_locked', 'server_error']
+            }],
+            [r'cgi-bin|\.cgi$', {
+                'MEDIUM': ['not_found', 'cgi_error'],
+                'HIGH': ['not_found', 'forbidden'],
+                'CRITICAL': ['cgi_error', 'server_error']
+            }]
+        ],
+        'fallback': {
+            'LOW': ['login_form'],
+            'MEDIUM': ['not_found'],
+            'HIGH': ['forbidden', 'login_locked'],
+            'CRITICAL': ['server_error', 'bad_request']
+        }
+    }
+
+
+class RenderedPage:
+    """Immutable, fully rendered persona page ready to be served as-is"""
+    __slots__ = ('name', 'status_code', 'body', 'etag', 'headers')
+
+    def __init__(self, name, status_code, content_type, body, server):
+        body = body.encode('utf-8')
+        etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'status_code', status_code)
+        object.__setattr__(self, 'body', body)
+        object.__setattr__(self, 'etag', etag)
+        object.__setattr__(self, 'headers', (
+            ('Server', server),
+            ('Content-Type', content_type),
+            ('Content-Length', str(len(body))),
+            ('ETag', etag),
+            ('Cache-Control', 'no-cache')
+        ))
+
+    def __setattr__(self, key, value):
+        raise AttributeError("RenderedPage is immutable")
+
+
+class PersonaPack:
+    """A persona pack rendered once into lookup tables of RenderedPage variants"""
+
+    def __init__(self, pack):
+        self.name = pack.get('name', 'unnamed')
+        server = pack.get('server', 'Boa/0.94.14rc21')
+
+        if not isinstance(server, str):
+            raise ValueError(f"Persona pack '{self.name}' server must be a string")
+
+        pages = {}
+        for page_name, page in pack['pages'].items():
+            status = page.get('status', 200)
+            content_type = page.get('content_type', 'text/html')
+            body = page.get('body')
+            # bool is an int subclass, so rule it out explicitly
+            if isinstance(status, bool) or not isinstance(status, int) or not 100 <= status <= 599:
+                raise ValueError(f"Persona page '{page_name}' status must be an int in 100-599, got {status!r}")
+            if not isinstance(content_type, str):
+                raise ValueError(f"Persona page '{page_name}' content_type must be a string")
+            if not isinstance(body, str):
+                raise ValueError(f"Persona page '{page_name}' body must be a string")
+            pages[page_name] = RenderedPage(page_name, status, content_type, body, server)
+
+        self.fallback = self._resolve(pages, pack.get('fallback', {}))
+        for threat_level in THREAT_LEVELS:
+            if not self.fallback.get(threat_level):
+                raise ValueError(f"Persona pack '{self.name}' has no fallback for {threat_level}")
+
+        self.routes = tuple(
+            (re.compile(pattern, re.IGNORECASE), self._resolve(pages, variants))
+            for pattern, variants in pack.get('routes', [])
+        )
+        self.page_count = len(pages)
+
+    @staticmethod
+    def _resolve(pages, variants):
+        """Map each threat level to a tuple of rendered pages"""
+        if not isinstance(variants, dict):
+            raise ValueError(f"Persona variants must map threat levels to pages, got {variants!r}")
+        resolved = {}
+        for threat_level, page_names in variants.items():
+            if threat_level not in THREAT_LEVELS:
+                raise ValueError(f"Unknown threat level in persona pack: {threat_level!r}")
+            if (not isinstance(page_names, (list, tuple)) or not page_names
+                    or not all(isinstance(n, str) for n in page_names)):
+                raise ValueError(f"{threat_level} variants must be a non-empty list of page names")
+            missing = [n for n in page_names if n not in pages]
+            if missing:
+                raise ValueError(f"Unknown persona pages: {', '.join(missing)}")
+            resolved[threat_level] = tuple(pages[n] for n in page_names)
+        return resolved
+
+    def select(self, path, threat_level):
+        """Pick a rendered page variant for this route and threat level"""
+        for route_regex, variants in self.routes:
+            if route_regex.search(path):
+                candidates = variants.get(threat_level)
+                if candidates:
+                    return random.choice(candidates)
+                break
+        return random.choice(self.fallback[threat_level])
+
+
+class PersonaCache:
+    """Holds the active persona pack; packs can be hot-swapped at runtime"""
+
+    def __init__(self, pack=None):
+        self.pack = PersonaPack(pack or default_persona_pack())
+
+    def select(self, path, threat_level):
+        # Read the reference once so a concurrent swap never mixes two packs
+        return self.pack.select(path or '/', threat_level)
+
+    def swap(self, pack):
+        """Render a new persona pack and atomically replace the active one"""
+        rendered = PersonaPack(pack)
+        self.pack = rendered
+        print(f"🎭 Persona pack '{rendered.name}' loaded ({rendered.page_count} pages)")
+        return rendered
+
+    def load_file(self, pack_path):
+        """Load a persona pack from a JSON file and hot-swap it in"""
+        with open(pack_path, 'r') as f:
+            return self.swap(json.load(f))
+
+
+# Smoke test the persona cache
+if __name__ == '__main__':
+    cache = PersonaCache()
+
+    print("=" * 70)
+    print("🎭 PERSONA CACHE SMOKE TEST")
+    print("=" * 70)
+
+    # One path per route plus an unmatched path that always uses the fallback
+    test_paths = ['/status.json', '/boaform/admin/formLogin', '/login.cgi', '/cgi-bin/luci', '/config']
+    for path in test_paths:
+        print(f"\n🔍 {path}")
+        for threat_level in THREAT_LEVELS:
+            page = cache.select(path, threat_level)
+            print(f"   {threat_level + ':':<10} {page.name:<20} {page.status_code}")
+
+    # Rendered headers must agree with the cached body
+    page = cache.select('/status.json', 'HIGH')
+    headers = dict(page.headers)
+    expected_etag = '"' + hashlib.sha1(page.body).hexdigest()[:16] + '"'
+    assert headers['Content-Length'] == str(len(page.body))
+    assert headers['ETag'] == page.etag == expected_etag
+    print(f"\n✅ {page.name}: Content-Length {headers['Content-Length']}, ETag {page.etag}")
+
+    # Broken packs must be rejected without replacing the active one
+    active = cache.pack
+    bad_threat_pack = default_persona_pack()
+    bad_threat_pack['routes'][0][1]['high'] = ['status_json']
+    bad_status_pack = default_persona_pack()
+    bad_status_pack['pages']['not_found']['status'] = '404'
+    for bad_pack in (bad_threat_pack, bad_status_pack):
+        try:
+            cache.swap(bad_pack)
+            print("❌ Invalid persona pack was accepted")
+        except ValueError as e:
+            print(f"✅ Invalid persona pack rejected: {e}")
+        assert cache.pack is active
+
+    cache.swap(default_persona_pack())
+    assert cache.pack is not active
+    print("=" * 70)
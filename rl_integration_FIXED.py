@@ -16,10 +16,10 @@ class RLEnhancedHoneypot:
         self.engagement_tracker = {}
         
         self.actions = [
-            {'name': 'LOW', 'delay': 1, 'status': 200},
-            {'name': 'MEDIUM', 'delay': 3, 'status': 404},
-            {'name': 'HIGH', 'delay': 5, 'status': 403},
-            {'name': 'CRITICAL', 'delay': 8, 'status': 500}
+            {'name': 'LOW', 'delay': 1},
+            {'name': 'MEDIUM', 'delay': 3},
+            {'name': 'HIGH', 'delay': 5},
+            {'name': 'CRITICAL', 'delay': 8}
         ]
         print(f"🤖 RL Agent initialized with {len(self.q_table)} states")
     
@@ -183,7 +183,7 @@ class RLEnhancedHoneypot:
         threat_order = {'LOW': 1, 'MEDIUM': 2, 'HIGH': 3, 'CRITICAL': 4}
         final_threat = ai_threat if threat_order[ai_threat] >= threat_order[rl_threat] else rl_threat
         
-        response = self.ai_engine.generate_response(final_threat)
+        response = self.ai_engine.generate_response(final_threat, path=path)
         response['rl_response'] = {
             'state': state_key,
             'rl_recommendation': rl_threat,